@@ -10,6 +10,11 @@ gcp_region = config.require("gcp:region")
 app_name = config.get("app_name") or "churn-agent-app"
 environment = config.get("environment") or "dev"
 
+# Warm instances for the model service avoid cold-start latency on the first
+# prediction, but each one bills continuously - default to 0 and opt in with
+# `pulumi config set model_min_instances 1` when the workload warrants it.
+model_min_instances = config.get_int("model_min_instances") or 0
+
 # Create a GCP provider
 provider = gcp.Provider("gcp", project=gcp_project, region=gcp_region)
 
@@ -47,11 +52,50 @@ storage_role = gcp.projects.IAMBinding(
     opts=pulumi.ResourceOptions(provider=provider),
 )
 
+# Create a Cloud SQL instance for the database. Declared before the Cloud Run
+# services (it is by far the slowest resource and depends on nothing they
+# create) so Pulumi can provision it in parallel with everything below.
+db_instance = gcp.sql.DatabaseInstance(
+    f"{app_name}-db",
+    database_version="MYSQL_8_0",
+    region=gcp_region,
+    settings={
+        "tier": "db-f1-micro",
+        "availability_type": "REGIONAL",
+        "backup_configuration": {
+            "enabled": True,
+            "start_time": "03:00",
+        },
+    },
+    opts=pulumi.ResourceOptions(provider=provider),
+)
+
+# Create a database
+database = gcp.sql.Database(
+    f"{app_name}-db-instance",
+    instance=db_instance.name,
+    opts=pulumi.ResourceOptions(provider=provider),
+)
+
+# Create a database user
+db_user = gcp.sql.User(
+    f"{app_name}-db-user",
+    instance=db_instance.name,
+    name="churn_user",
+    password=config.require_secret("db_password"),
+    opts=pulumi.ResourceOptions(provider=provider),
+)
+
 # Create a Cloud Run service for the FastAPI model server
 model_service = gcp.cloudrun.Service(
     f"{app_name}-model-service",
     location=gcp_region,
     template={
+        "metadata": {
+            "annotations": {
+                "autoscaling.knative.dev/minScale": str(model_min_instances),
+            },
+        },
         "spec": {
             "containers": [
                 {
@@ -96,7 +140,9 @@ web_service = gcp.cloudrun.Service(
             "service_account_name": service_account.email,
         }
     },
-    opts=pulumi.ResourceOptions(provider=provider, depends_on=[model_service]),
+    # No explicit depends_on: the MODEL_SERVICE_URL Output reference above
+    # already makes this depend on model_service without over-serializing.
+    opts=pulumi.ResourceOptions(provider=provider),
 )
 
 # Make the services publicly accessible
@@ -118,38 +164,6 @@ web_iam = gcp.cloudrun.IamMember(
     opts=pulumi.ResourceOptions(provider=provider),
 )
 
-# Create a Cloud SQL instance for the database
-db_instance = gcp.sql.DatabaseInstance(
-    f"{app_name}-db",
-    database_version="MYSQL_8_0",
-    region=gcp_region,
-    settings={
-        "tier": "db-f1-micro",
-        "availability_type": "REGIONAL",
-        "backup_configuration": {
-            "enabled": True,
-            "start_time": "03:00",
-        },
-    },
-    opts=pulumi.ResourceOptions(provider=provider),
-)
-
-# Create a database
-database = gcp.sql.Database(
-    f"{app_name}-db-instance",
-    instance=db_instance.name,
-    opts=pulumi.ResourceOptions(provider=provider),
-)
-
-# Create a database user
-db_user = gcp.sql.User(
-    f"{app_name}-db-user",
-    instance=db_instance.name,
-    name="churn_user",
-    password=config.require_secret("db_password"),
-    opts=pulumi.ResourceOptions(provider=provider),
-)
-
 # Export the URLs
 pulumi.export("model_service_url", model_service.statuses[0].url)
 pulumi.export("web_service_url", web_service.statuses[0].url)
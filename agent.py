@@ -1,8 +1,12 @@
 
 import gspread
+import numpy as np
+import orjson
 import pandas as pd
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from functools import lru_cache
 import os
 
 # Placeholder for service account file path
@@ -14,26 +18,81 @@ MODEL_SERVICE_URL = "https://8000-i0bfst9t6on99c9vfewou-b0de354a.manus.computer/
 # Placeholder for Google Sheet ID
 GOOGLE_SHEET_ID = ""
 
+# Authorized gspread client and opened spreadsheets, reused across polls -
+# gspread.service_account() otherwise re-authorizes and opens a fresh HTTP
+# session on every call.
+_GSPREAD_CLIENT = None
+_SPREADSHEET_CACHE = {}
+
+def _get_spreadsheet(sheet_id):
+    global _GSPREAD_CLIENT
+    if _GSPREAD_CLIENT is None:
+        _GSPREAD_CLIENT = gspread.service_account(filename=SERVICE_ACCOUNT_FILE)
+        # Keep-alive connection pool for repeated polls
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        _GSPREAD_CLIENT.http_client.session.mount("https://", adapter)
+    spreadsheet = _SPREADSHEET_CACHE.get(sheet_id)
+    if spreadsheet is None:
+        spreadsheet = _GSPREAD_CLIENT.open_by_key(sheet_id)
+        _SPREADSHEET_CACHE[sheet_id] = spreadsheet
+    return spreadsheet
+
 def get_latest_customer_data(sheet_id, num_records=50):
     try:
-        gc = gspread.service_account(filename=SERVICE_ACCOUNT_FILE)
-        spreadsheet = gc.open_by_id(sheet_id)
+        spreadsheet = _get_spreadsheet(sheet_id)
         worksheet = spreadsheet.sheet1  # Assuming data is in the first sheet
-        
-        # Get all records and then select the latest num_records
-        records = worksheet.get_all_records()
-        latest_data = records[-num_records:]
+
+        # row_count is sheet metadata - no data fetch
+        row_count = worksheet.row_count
+        first_row = max(2, row_count - num_records + 1)
+
+        # One batched RPC for the header row plus the tail of the sheet
+        ranges = spreadsheet.values_batch_get(
+            ["A1:T1", f"A{first_row}:T{row_count}"]
+        )["valueRanges"]
+        header = ranges[0].get("values", [[]])[0]
+        rows = ranges[1].get("values", [])
+
+        latest_data = [dict(zip(header, row)) for row in rows]
         return latest_data
     except Exception as e:
         print(f"Error reading Google Sheet: {e}")
         return None
 
+# Shared keep-alive session for model-service calls - avoids a new TCP/TLS
+# handshake per poll and retries transient 5xx responses.
+_MODEL_SESSION = requests.Session()
+_MODEL_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[500, 502, 503, 504],
+            allowed_methods=["POST"],
+        ),
+    ),
+)
+
+@lru_cache(maxsize=128)
+def _cached_model_call(payload):
+    """POST a canonical JSON payload to the model service. Cached on the
+    payload bytes, so a poll that resends the same batch skips the model
+    entirely; failures raise and are not cached."""
+    headers = {"Content-Type": "application/json"}
+    response = _MODEL_SESSION.post(
+        MODEL_SERVICE_URL, headers=headers, data=payload, timeout=10.0
+    )
+    response.raise_for_status()  # Raise an exception for HTTP errors
+    return tuple(response.json()["churn_probabilities"])
+
 def predict_churn_with_model(customer_data):
     try:
-        headers = {"Content-Type": "application/json"}
-        response = requests.post(MODEL_SERVICE_URL, headers=headers, data=json.dumps(customer_data))
-        response.raise_for_status()  # Raise an exception for HTTP errors
-        return response.json()["churn_probabilities"]
+        # OPT_SORT_KEYS makes the serialized batch a stable cache key
+        payload = orjson.dumps(customer_data, option=orjson.OPT_SORT_KEYS)
+        return list(_cached_model_call(payload))
     except requests.exceptions.RequestException as e:
         print(f"Error calling model service: {e}")
         return None
@@ -42,8 +101,9 @@ def summarize_churn_data(churn_probabilities):
     if not churn_probabilities:
         return "No churn data available for summarization."
 
-    total_customers = len(churn_probabilities)
-    churn_count = sum(1 for prob in churn_probabilities if prob >= 0.5) # Assuming 0.5 as churn threshold
+    probs = np.asarray(churn_probabilities, dtype=np.float32)
+    total_customers = probs.size
+    churn_count = int((probs >= 0.5).sum()) # Assuming 0.5 as churn threshold
     churn_rate = (churn_count / total_customers) * 100
 
     summary = f"Out of the latest {total_customers} customer records, {churn_count} customers are predicted to churn, resulting in a churn rate of {churn_rate:.2f}%."
@@ -204,7 +204,9 @@ deploy_infrastructure() {
     fi
     
     print_info "Deploying infrastructure (this may take 10-15 minutes)..."
-    pulumi up --yes
+    # Fan out independent resources (buckets, SA, Cloud SQL, Cloud Run) rather
+    # than relying on the default parallelism
+    pulumi up --yes --parallel=$(( $(nproc) * 4 ))
     print_success "Infrastructure deployed successfully"
 }
 
@@ -7,12 +7,38 @@ and prepares the test set for upload to Google Sheets.
 
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
+import pyarrow as pa
+import pyarrow.csv as pacsv
 import kagglehub
 import os
 import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+# Explicit dtypes for the known Telco schema: skips pandas' type inference
+# and stores the multi-valued string columns as compact categories. Yes/No
+# columns stay plain strings so preprocess_dataset can convert them to
+# binary, and TotalCharges is parsed later with to_numeric because the raw
+# file contains blank cells.
+TELCO_DTYPES = {
+    'customerID': 'string',
+    'gender': 'category',
+    'SeniorCitizen': 'int8',
+    'tenure': 'int32',
+    'MultipleLines': 'category',
+    'InternetService': 'category',
+    'OnlineSecurity': 'category',
+    'OnlineBackup': 'category',
+    'DeviceProtection': 'category',
+    'TechSupport': 'category',
+    'StreamingTV': 'category',
+    'StreamingMovies': 'category',
+    'Contract': 'category',
+    'PaymentMethod': 'category',
+    'MonthlyCharges': 'float32',
+}
+
 def download_dataset():
     """Download the Telco Customer Churn dataset from Kaggle"""
     print("=" * 60)
@@ -45,25 +71,46 @@ def load_and_explore_dataset(csv_file):
     print("Loading and Exploring Dataset...")
     print("=" * 60)
     
-    df = pd.read_csv(csv_file)
-    
+    df = pd.read_csv(csv_file, engine="pyarrow", dtype=TELCO_DTYPES)
+
     print(f"\nDataset Shape: {df.shape}")
     print(f"Total Records: {len(df)}")
     print(f"Total Columns: {len(df.columns)}")
     
     print("\nColumn Names:")
-    for i, col in enumerate(df.columns, 1):
-        print(f"  {i}. {col}")
-    
-    print("\nData Types:")
-    print(df.dtypes)
-    
-    print("\nMissing Values:")
-    print(df.isnull().sum())
-    
+    print(df.columns.to_numpy())
+
+    # One pass over the frame covers dtypes, null counts and memory usage
+    print("\nDataset Info:")
+    df.info(buf=sys.stdout, memory_usage='deep')
+
     print("\nFirst Few Rows:")
     print(df.head())
-    
+
+    return df
+
+# The Yes/No columns of the known Telco schema, used by the specialized
+# preprocessing path below
+TELCO_BINARY_COLS = ('Partner', 'Dependents', 'PhoneService', 'PaperlessBilling', 'Churn')
+
+def preprocess_telco(df):
+    """Specialized preprocessing for the known Telco schema: the column names
+    and their conversions are fixed, so there is no per-column discovery -
+    just one numeric coercion and one block-level binary conversion"""
+    print("\n" + "=" * 60)
+    print("Preprocessing Dataset (Telco fast path)...")
+    print("=" * 60)
+
+    df['TotalCharges'] = pd.to_numeric(
+        df['TotalCharges'],
+        errors='coerce',
+        downcast='float'
+    ).fillna(0)
+
+    binary_cols = list(TELCO_BINARY_COLS)
+    df[binary_cols] = df[binary_cols].isin(['Yes', 'yes']).astype('uint8')
+
+    print(f"✓ Preprocessing complete")
     return df
 
 def preprocess_dataset(df):
@@ -72,63 +119,81 @@ def preprocess_dataset(df):
     print("Preprocessing Dataset...")
     print("=" * 60)
     
-    df_processed = df.copy()
-    
+    # Operate on df in place - callers don't reuse the raw frame, and the copy
+    # doubled peak memory for no benefit
+
     # Handle TotalCharges - convert to numeric, replacing empty strings with 0
-    if 'TotalCharges' in df_processed.columns:
-        df_processed['TotalCharges'] = pd.to_numeric(
-            df_processed['TotalCharges'], 
-            errors='coerce'
+    if 'TotalCharges' in df.columns:
+        df['TotalCharges'] = pd.to_numeric(
+            df['TotalCharges'],
+            errors='coerce',
+            downcast='float'
         ).fillna(0)
         print("✓ Converted TotalCharges to numeric")
-    
-    # Convert Yes/No to 1/0 for binary columns
-    binary_columns = [col for col in df_processed.columns 
-                     if df_processed[col].dtype == 'object' 
-                     and set(df_processed[col].unique()) <= {'Yes', 'No', 'yes', 'no'}]
-    
-    for col in binary_columns:
-        df_processed[col] = df_processed[col].map({'Yes': 1, 'No': 0, 'yes': 1, 'no': 0})
-        print(f"✓ Converted {col} to binary")
-    
-    # Convert SeniorCitizen if it exists and is numeric
-    if 'SeniorCitizen' in df_processed.columns:
-        df_processed['SeniorCitizen'] = pd.to_numeric(
-            df_processed['SeniorCitizen'], 
+
+    # Convert Yes/No to 1/0 for binary columns: map each object column and
+    # keep the result only when every value mapped (no NaNs), instead of
+    # building a Python set of unique values per column
+    yes_no_map = {'Yes': 1, 'No': 0, 'yes': 1, 'no': 0}
+    yes_no_values = np.array(list(yes_no_map))
+    for col in df.columns[df.dtypes == object]:
+        # Cheap 256-row sample check lets non-binary columns bail out before
+        # the full-column map
+        if not np.isin(df[col].to_numpy()[:256], yes_no_values).all():
+            continue
+        mapped = df[col].map(yes_no_map)
+        if not mapped.isna().any():
+            df[col] = mapped.astype('Int8', copy=False)
+            print(f"✓ Converted {col} to binary")
+
+    # SeniorCitizen already arrives as int8 via TELCO_DTYPES; only coerce
+    # when a different source file leaves it as strings
+    if 'SeniorCitizen' in df.columns and df['SeniorCitizen'].dtype == object:
+        df['SeniorCitizen'] = pd.to_numeric(
+            df['SeniorCitizen'],
             errors='coerce'
-        ).fillna(0).astype(int)
-    
+        ).fillna(0).astype('int8')
+
     print(f"✓ Preprocessing complete")
-    return df_processed
+    return df
 
-def split_dataset(df, train_ratio=0.7, val_ratio=0.15, test_ratio=0.15):
+def split_dataset(df, train_ratio=0.7, val_ratio=0.15, test_ratio=0.15, verbose=True):
     """Split dataset into train, validation, and test sets"""
     print("\n" + "=" * 60)
     print("Splitting Dataset...")
     print("=" * 60)
     
-    # First split: train+val vs test
-    train_val_df, test_df = train_test_split(
-        df, 
-        test_size=test_ratio, 
-        random_state=42,
-        stratify=df.get('Churn', None) if 'Churn' in df.columns else None
-    )
-    
-    # Second split: train vs val
-    train_df, val_df = train_test_split(
-        train_val_df,
-        test_size=val_ratio / (train_ratio + val_ratio),
-        random_state=42,
-        stratify=train_val_df.get('Churn', None) if 'Churn' in train_val_df.columns else None
-    )
-    
+    # One stratified permutation instead of two train_test_split calls: group
+    # row positions by Churn, shuffle each group once, slice the three ratio
+    # ranges, and index the frame directly - no intermediate train+val copy
+    rng = np.random.default_rng(42)
+    if 'Churn' in df.columns:
+        # Group on int8 category codes rather than hashing/comparing the
+        # raw values themselves
+        churn_codes = df['Churn'].astype('category').cat.codes.to_numpy()
+        groups = [np.flatnonzero(churn_codes == code) for code in np.unique(churn_codes)]
+    else:
+        groups = [np.arange(len(df))]
+
+    train_parts, val_parts, test_parts = [], [], []
+    for group in groups:
+        idx = rng.permutation(group)
+        n_train = int(len(idx) * train_ratio)
+        n_val = int(len(idx) * val_ratio)
+        train_parts.append(idx[:n_train])
+        val_parts.append(idx[n_train:n_train + n_val])
+        test_parts.append(idx[n_train + n_val:])
+
+    train_df = df.iloc[np.concatenate(train_parts)]
+    val_df = df.iloc[np.concatenate(val_parts)]
+    test_df = df.iloc[np.concatenate(test_parts)]
+
     print(f"\nDataset Split:")
     print(f"  Training Set:   {len(train_df):,} records ({len(train_df)/len(df)*100:.1f}%)")
     print(f"  Validation Set: {len(val_df):,} records ({len(val_df)/len(df)*100:.1f}%)")
     print(f"  Test Set:       {len(test_df):,} records ({len(test_df)/len(df)*100:.1f}%)")
     
-    if 'Churn' in df.columns:
+    if verbose and 'Churn' in df.columns:
         print(f"\nChurn Distribution:")
         print(f"  Training:   {train_df['Churn'].value_counts().to_dict()}")
         print(f"  Validation: {val_df['Churn'].value_counts().to_dict()}")
@@ -136,6 +201,15 @@ def split_dataset(df, train_ratio=0.7, val_ratio=0.15, test_ratio=0.15):
     
     return train_df, val_df, test_df
 
+def write_csv_arrow(df, path):
+    """Write a DataFrame as CSV through Arrow's streaming writer, which
+    formats rows into a reusable output buffer instead of allocating a
+    Python string per cell"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(path, 'wb') as sink:
+        with pacsv.CSVWriter(sink, table.schema) as writer:
+            writer.write_table(table)
+
 def save_datasets(train_df, val_df, test_df, output_dir='.'):
     """Save the split datasets to CSV files"""
     print("\n" + "=" * 60)
@@ -145,16 +219,19 @@ def save_datasets(train_df, val_df, test_df, output_dir='.'):
     train_path = os.path.join(output_dir, 'train_data.csv')
     val_path = os.path.join(output_dir, 'validation_data.csv')
     test_path = os.path.join(output_dir, 'test_data.csv')
-    
-    train_df.to_csv(train_path, index=False)
+
+    # The three writes are independent and Arrow's C++ CSV writer releases
+    # the GIL, so overlap them on a small thread pool
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        list(executor.map(
+            lambda job: write_csv_arrow(job[0], job[1]),
+            [(train_df, train_path), (val_df, val_path), (test_df, test_path)]
+        ))
+
     print(f"✓ Training data saved to: {train_path}")
-    
-    val_df.to_csv(val_path, index=False)
     print(f"✓ Validation data saved to: {val_path}")
-    
-    test_df.to_csv(test_path, index=False)
     print(f"✓ Test data saved to: {test_path}")
-    
+
     return train_path, val_path, test_path
 
 def prepare_google_sheets_format(test_df):
@@ -163,9 +240,6 @@ def prepare_google_sheets_format(test_df):
     print("Preparing Data for Google Sheets...")
     print("=" * 60)
     
-    # Create a copy for Google Sheets
-    sheets_df = test_df.copy()
-    
     # Rename columns to match expected format
     column_mapping = {
         'customerID': 'customerID',
@@ -190,21 +264,56 @@ def prepare_google_sheets_format(test_df):
         'TotalCharges': 'TotalCharges',
     }
     
-    # Keep only the columns we need
-    available_cols = [col for col in column_mapping.keys() if col in sheets_df.columns]
-    sheets_df = sheets_df[available_cols]
-    
-    # Convert binary columns back to Yes/No for readability
-    for col in sheets_df.columns:
-        if sheets_df[col].dtype in [int, float]:
-            if set(sheets_df[col].unique()) <= {0, 1, 0.0, 1.0}:
-                sheets_df[col] = sheets_df[col].map({1: 'Yes', 0: 'No'})
-    
+    # Keep only the columns we need - selecting them already yields a new
+    # frame, so the up-front full copy was redundant
+    available_cols = [col for col in column_mapping.keys() if col in test_df.columns]
+    sheets_df = test_df[available_cols]
+
+    # Convert binary columns back to Yes/No for readability: one block-level
+    # comparison finds the 0/1 columns and one np.where maps them all back,
+    # replacing the per-column set(unique()) and dict map passes
+    numeric = sheets_df.select_dtypes(include=[np.number])
+    binary_cols = numeric.columns[((numeric == 0) | (numeric == 1)).all(axis=0)]
+    if len(binary_cols):
+        yes_no = np.where(sheets_df[binary_cols].to_numpy(dtype=bool), 'Yes', 'No')
+        sheets_df = sheets_df.assign(
+            **{col: yes_no[:, k] for k, col in enumerate(binary_cols)}
+        )
+
     print(f"✓ Prepared {len(sheets_df)} records for Google Sheets")
     print(f"✓ Columns: {list(sheets_df.columns)}")
     
     return sheets_df
 
+def upload_to_sheets(sheets_df, sheet_id, chunk_size=500):
+    """Upload the prepared test data to Google Sheets in batched calls"""
+    print("\n" + "=" * 60)
+    print("Uploading Test Data to Google Sheets...")
+    print("=" * 60)
+
+    # Imported here so dataset preparation still works without gspread
+    import gspread
+
+    gc = gspread.service_account(filename='service_account.json')
+    worksheet = gc.open_by_key(sheet_id).sheet1
+
+    last_col = chr(ord('A') + len(sheets_df.columns) - 1)
+    values = [list(sheets_df.columns)] + sheets_df.astype(str).to_numpy().tolist()
+
+    # Grow the grid up front - writing past the default 1,000-row sheet is
+    # rejected with an "exceeds grid limits" error
+    worksheet.resize(rows=len(values), cols=len(sheets_df.columns))
+
+    # One RPC per chunk instead of per-row updates
+    for start in range(0, len(values), chunk_size):
+        chunk = values[start:start + chunk_size]
+        worksheet.batch_update([{
+            'range': f"A{start + 1}:{last_col}{start + len(chunk)}",
+            'values': chunk,
+        }])
+
+    print(f"✓ Uploaded {len(sheets_df)} records in {-(-len(values) // chunk_size)} batched calls")
+
 def create_upload_instructions(test_df_sheets):
     """Create instructions for uploading to Google Sheets"""
     print("\n" + "=" * 60)
@@ -271,8 +380,12 @@ def main():
         # Step 2: Load and explore
         df = load_and_explore_dataset(csv_file)
         
-        # Step 3: Preprocess
-        df_processed = preprocess_dataset(df)
+        # Step 3: Preprocess - take the specialized path when the expected
+        # Telco columns are present, falling back to schema discovery
+        if 'TotalCharges' in df.columns and set(TELCO_BINARY_COLS) <= set(df.columns):
+            df_processed = preprocess_telco(df)
+        else:
+            df_processed = preprocess_dataset(df)
         
         # Step 4: Split into train/val/test
         train_df, val_df, test_df = split_dataset(df_processed)
@@ -283,9 +396,14 @@ def main():
         # Step 6: Prepare for Google Sheets
         test_df_sheets = prepare_google_sheets_format(test_df)
         sheets_path = 'test_data_for_sheets.csv'
-        test_df_sheets.to_csv(sheets_path, index=False)
+        write_csv_arrow(test_df_sheets, sheets_path)
         print(f"✓ Google Sheets format saved to: {sheets_path}")
-        
+
+        # Upload directly when service-account credentials are available;
+        # otherwise fall back to the manual instructions below
+        if os.path.exists('service_account.json'):
+            upload_to_sheets(test_df_sheets, "11tlFA84AZnfGJf1UeWBe5jjbF4oGIID4VuqK14qXejs")
+
         # Step 7: Create upload instructions
         instructions = create_upload_instructions(test_df_sheets)
         
@@ -298,18 +416,19 @@ def main():
         print("\n" + "=" * 60)
         print("Dataset Preparation Complete!")
         print("=" * 60)
-        print(f"\nGenerated Files:")
-        print(f"  1. train_data.csv - Training set ({len(train_df)} records)")
-        print(f"  2. validation_data.csv - Validation set ({len(val_df)} records)")
-        print(f"  3. test_data.csv - Test set ({len(test_df)} records)")
-        print(f"  4. test_data_for_sheets.csv - Ready for Google Sheets")
-        print(f"  5. SHEETS_UPLOAD_INSTRUCTIONS.txt - Upload guide")
-        
-        print(f"\nNext Steps:")
-        print(f"  1. Upload test_data_for_sheets.csv to your Google Sheet")
-        print(f"  2. Use train_data.csv to train the XGBoost model")
-        print(f"  3. Use validation_data.csv to validate the model")
-        print(f"  4. Use test_data.csv for final testing")
+        print("\n".join([
+            f"\nGenerated Files:",
+            f"  1. train_data.csv - Training set ({len(train_df)} records)",
+            f"  2. validation_data.csv - Validation set ({len(val_df)} records)",
+            f"  3. test_data.csv - Test set ({len(test_df)} records)",
+            f"  4. test_data_for_sheets.csv - Ready for Google Sheets",
+            f"  5. SHEETS_UPLOAD_INSTRUCTIONS.txt - Upload guide",
+            f"\nNext Steps:",
+            f"  1. Upload test_data_for_sheets.csv to your Google Sheet",
+            f"  2. Use train_data.csv to train the XGBoost model",
+            f"  3. Use validation_data.csv to validate the model",
+            f"  4. Use test_data.csv for final testing",
+        ]))
         
         return True
         